@@ -0,0 +1 @@
+"""Benchmarks and load tests for the Pali lookup and LLM generation services."""
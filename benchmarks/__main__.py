@@ -0,0 +1,174 @@
+"""
+Command-line entry point: ``python -m benchmarks run`` and ``python -m benchmarks compare``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List
+
+from .harness import FakeLatency, load_services, write_synthetic_dictionary
+from .load import llm_scenarios, pali_scenarios, run_load, serve
+from .micro import run_micro
+
+# Metrics where a larger value is a regression; throughput is the opposite.
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms")
+HIGHER_IS_BETTER = ("throughput_per_s",)
+
+
+def _run(args: argparse.Namespace) -> int:
+    latency = FakeLatency(embed_ms=args.embed_latency_ms, translate_ms=args.translate_latency_ms, genai_ms=args.genai_latency_ms)
+    report: Dict[str, object] = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_ms": vars(latency),
+            "dictionary_size": None if args.data_dir else args.dictionary_size,
+            "iterations": args.iterations,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        }
+    }
+
+    with ExitStack() as stack:
+        scratch_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="chantgpt-bench-")))
+        if args.data_dir:
+            data_dir = Path(args.data_dir)
+        else:
+            data_dir = scratch_dir
+            write_synthetic_dictionary(data_dir, args.dictionary_size, seed=args.seed)
+        # Never write a fake-embedding index into a real data directory.
+        services = load_services(data_dir, latency, index_dir=scratch_dir)
+
+        pali_url = args.pali_url or stack.enter_context(serve(services.pali.app))
+        services.retrievers.PALI_API_URL = pali_url
+
+        if args.suite in ("micro", "all"):
+            report["micro"] = run_micro(services, iterations=args.iterations, seed=args.seed, pali_url=pali_url)
+
+        if args.suite in ("load", "all"):
+            llm_url = args.llm_url or stack.enter_context(serve(services.llm_service.app))
+            scenarios = {**pali_scenarios(pali_url), **llm_scenarios(llm_url)}
+            report["load"] = run_load(scenarios, args.requests, args.concurrency, seed=args.seed)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    print(text)
+    return 0
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float) -> List[Dict[str, object]]:
+    """
+    Return one row per shared metric with its relative change and whether it regressed
+    by more than ``threshold`` (a fraction, e.g. 0.1 for 10%). A baseline benchmark
+    absent from ``current`` yields a ``missing`` row, and any rise in ``errors`` yields
+    an ``errors`` row; both count as regressions regardless of ``threshold``.
+    """
+    rows: List[Dict[str, object]] = []
+    for section in ("micro", "load"):
+        for name, base_stats in baseline.get(section, {}).items():
+            cur_stats = current.get(section, {}).get(name)
+            if cur_stats is None:
+                # A benchmark that stopped reporting must not pass the gate silently.
+                rows.append(
+                    {
+                        "benchmark": f"{section}.{name}",
+                        "metric": "missing",
+                        "baseline": None,
+                        "current": None,
+                        "change": None,
+                        "regressed": True,
+                    }
+                )
+                continue
+            for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                base, cur = base_stats.get(metric), cur_stats.get(metric)
+                if not base or cur is None:
+                    continue
+                change = (cur - base) / base
+                worse = change if metric in LOWER_IS_BETTER else -change
+                rows.append(
+                    {
+                        "benchmark": f"{section}.{name}",
+                        "metric": metric,
+                        "baseline": base,
+                        "current": cur,
+                        "change": change,
+                        "regressed": worse > threshold,
+                    }
+                )
+            base_errors, cur_errors = base_stats.get("errors", 0), cur_stats.get("errors", 0)
+            if base_errors or cur_errors:
+                # Failed requests are fast, so errors can hide behind better latency.
+                rows.append(
+                    {
+                        "benchmark": f"{section}.{name}",
+                        "metric": "errors",
+                        "baseline": base_errors,
+                        "current": cur_errors,
+                        "change": None,
+                        "regressed": cur_errors > base_errors,
+                    }
+                )
+    return rows
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    rows = compare_reports(baseline, current, args.threshold)
+    for row in rows:
+        if row["metric"] == "missing":
+            print(f"{row['benchmark']:<40} MISSING from current report")
+            continue
+        flag = "REGRESSED" if row["regressed"] else ""
+        if row["metric"] == "errors":
+            print(f"{row['benchmark']:<40} {'errors':<18} {row['baseline']:>12} -> {row['current']:>12} {flag}")
+            continue
+        print(
+            f"{row['benchmark']:<40} {row['metric']:<18} "
+            f"{row['baseline']:>12.3f} -> {row['current']:>12.3f} ({row['change']:+.1%}) {flag}"
+        )
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="ChantGPT benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run micro-benchmarks and/or the HTTP load test")
+    run.add_argument("--suite", choices=["micro", "load", "all"], default="all")
+    run.add_argument("--output", help="Write the JSON report to this path")
+    run.add_argument("--data-dir", help="Use a real processed data dir instead of a synthetic dictionary")
+    run.add_argument("--dictionary-size", type=int, default=20000, help="Rows in the synthetic dictionary")
+    run.add_argument("--iterations", type=int, default=200, help="Iterations per micro-benchmark")
+    run.add_argument("--requests", type=int, default=200, help="Requests per load scenario")
+    run.add_argument("--concurrency", type=int, default=16, help="Concurrent load-test workers")
+    run.add_argument("--embed-latency-ms", type=float, default=20.0, help="Fake Vertex embedding latency")
+    run.add_argument("--translate-latency-ms", type=float, default=30.0, help="Fake Cloud Translation latency")
+    run.add_argument("--genai-latency-ms", type=float, default=800.0, help="Fake Gemini latency")
+    run.add_argument("--pali-url", help="Load-test an already running Pali API instead of an in-process one")
+    run.add_argument("--llm-url", help="Load-test an already running LLM API instead of an in-process one")
+    run.add_argument("--seed", type=int, default=0)
+    run.set_defaults(func=_run)
+
+    compare = sub.add_parser("compare", help="Compare two JSON reports; exit 1 on regression")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown (default 0.1)")
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
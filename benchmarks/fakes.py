@@ -0,0 +1,120 @@
+"""
+Local stand-ins for the Vertex AI, Cloud Translation and Gemini clients.
+
+Each fake sleeps for a configurable latency per call and returns objects shaped
+like the real responses, so the services run unmodified without network access.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+EMBEDDING_DIM = 768
+
+
+def _sleep_ms(latency_ms: float) -> None:
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000.0)
+
+
+@dataclass
+class FakeTextEmbedding:
+    values: List[float]
+
+
+class FakeTextEmbeddingModel:
+    """
+    Drop-in for ``vertexai.preview.language_models.TextEmbeddingModel``.
+    Embeddings are deterministic per text so searches are repeatable.
+    """
+
+    latency_ms: float = 0.0
+    dim: int = EMBEDDING_DIM
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_pretrained(cls, model_name: str) -> "FakeTextEmbeddingModel":
+        return cls(model_name)
+
+    @classmethod
+    def with_latency(cls, latency_ms: float) -> type["FakeTextEmbeddingModel"]:
+        return type(cls.__name__, (cls,), {"latency_ms": latency_ms})
+
+    def get_embeddings(self, texts: Sequence[str]) -> List[FakeTextEmbedding]:
+        with self._lock:
+            self.calls += 1
+        _sleep_ms(self.latency_ms)
+        return [FakeTextEmbedding(values=self._vector(text).tolist()) for text in texts]
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+        return np.random.default_rng(seed).standard_normal(self.dim, dtype=np.float32)
+
+
+@dataclass
+class FakeTranslation:
+    translated_text: str
+
+
+@dataclass
+class FakeTranslateResponse:
+    translations: List[FakeTranslation]
+
+
+class FakeTranslationServiceClient:
+    """
+    Drop-in for ``google.cloud.translate.TranslationServiceClient``.
+    Returns the input prefixed with ``en:`` so callers still see a change.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate_text(self, request: dict) -> FakeTranslateResponse:
+        with self._lock:
+            self.calls += 1
+        _sleep_ms(self.latency_ms)
+        return FakeTranslateResponse(
+            translations=[FakeTranslation(translated_text=f"en:{text}") for text in request["contents"]]
+        )
+
+
+@dataclass
+class FakeGenerateContentResponse:
+    text: str
+
+
+class _FakeModels:
+    def __init__(self, client: "FakeGenaiClient") -> None:
+        self._client = client
+
+    def generate_content(self, *, model: str, contents: str, config: object = None) -> FakeGenerateContentResponse:
+        with self._client._lock:
+            self._client.calls += 1
+        _sleep_ms(self._client.latency_ms)
+        return FakeGenerateContentResponse(
+            text=f"PALI{{{model}}}\nTRANSLATION{{{len(contents)} prompt characters}}"
+        )
+
+
+class FakeGenaiClient:
+    """
+    Drop-in for ``google.genai.Client``; only ``models.generate_content`` is provided.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.models = _FakeModels(self)
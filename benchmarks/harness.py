@@ -0,0 +1,199 @@
+"""
+Shared setup for the benchmarks: loading both services, synthetic data, fakes and stats.
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from .fakes import FakeGenaiClient, FakeTextEmbeddingModel, FakeTranslationServiceClient
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PALI_PACKAGE_DIR = REPO_ROOT / "src" / "pali" / "src"
+LLM_PACKAGE_DIR = REPO_ROOT / "src" / "llm-api" / "src"
+
+# Both services ship a package named ``src``; load them under distinct names.
+PALI_ALIAS = "pali_src"
+LLM_ALIAS = "llm_api_src"
+
+BENCH_PROJECT = "benchmark-project"
+
+THAI_CONSONANTS = "กขคงจฉชซญฎฏฐฑฒณดตถทธนบปผพภมยรลวศษสหฬอฮ"
+THAI_VOWELS = ["ะ", "า", "ิ", "ี", "ุ", "ู", "ั", "ํ", "ฺ", ""]
+ROMAN_SYLLABLES = ["ka", "dha", "mma", "bu", "ddha", "sa", "ti", "pa", "ni", "va", "ra", "la", "su", "kha", "nta"]
+DEFINITION_WORDS = [
+    "merit", "wisdom", "peace", "health", "wealth", "happiness", "protection", "family",
+    "success", "compassion", "truth", "teacher", "path", "mind", "virtue", "long", "life",
+    "blessing", "calm", "strength", "study", "work", "love", "safety", "faith",
+]
+
+
+@dataclass
+class FakeLatency:
+    embed_ms: float = 20.0
+    translate_ms: float = 30.0
+    genai_ms: float = 800.0
+
+
+@dataclass
+class Services:
+    pali: ModuleType
+    lookup: ModuleType
+    semantic: ModuleType
+    llm_service: ModuleType
+    prompts: ModuleType
+    retrievers: ModuleType
+    embedding_model_cls: type[FakeTextEmbeddingModel]
+    translate_client: FakeTranslationServiceClient
+    genai_client: FakeGenaiClient
+
+
+def _load_package(alias: str, package_dir: Path) -> ModuleType:
+    if alias in sys.modules:
+        return sys.modules[alias]
+    spec = importlib.util.spec_from_file_location(
+        alias, package_dir / "__init__.py", submodule_search_locations=[str(package_dir)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[alias] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _thai_word(rng: random.Random) -> str:
+    return "".join(rng.choice(THAI_CONSONANTS) + rng.choice(THAI_VOWELS) for _ in range(rng.randint(2, 5)))
+
+
+def _roman_word(rng: random.Random) -> str:
+    return "".join(rng.choice(ROMAN_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def write_synthetic_dictionary(data_dir: Path, size: int, seed: int = 0) -> Path:
+    """
+    Write a synthetic ``pali_dictionary_with_thai.csv`` with ``size`` rows.
+    """
+    rng = random.Random(seed)
+    rows = [
+        {
+            "headword": _roman_word(rng),
+            "headword_thai": _thai_word(rng),
+            "definition": " ".join(rng.sample(DEFINITION_WORDS, rng.randint(2, 6))),
+        }
+        for _ in range(size)
+    ]
+    data_dir.mkdir(parents=True, exist_ok=True)
+    path = data_dir / "pali_dictionary_with_thai.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def load_services(
+    data_dir: Path,
+    latency: FakeLatency,
+    index_dir: Path | None = None,
+) -> Services:
+    """
+    Import both services against ``data_dir`` and swap the Vertex AI, Translation and
+    Gemini clients for local fakes. The semantic index is built up front (with zero
+    embedding latency) so it is not part of any measurement; if ``data_dir`` has none,
+    it is written to ``index_dir`` (default ``data_dir``).
+    """
+    os.environ["PALI_DATA_DIR"] = str(data_dir)
+    os.environ["VERTEX_PROJECT"] = BENCH_PROJECT
+    os.environ["GOOGLE_PROJECT_ID"] = BENCH_PROJECT
+
+    pali = _load_package(PALI_ALIAS, PALI_PACKAGE_DIR)
+    _load_package(LLM_ALIAS, LLM_PACKAGE_DIR)
+    lookup = importlib.import_module(f"{PALI_ALIAS}.lookup")
+    semantic = importlib.import_module(f"{PALI_ALIAS}.semantic")
+    llm_service = importlib.import_module(f"{LLM_ALIAS}.service")
+    prompts = importlib.import_module(f"{LLM_ALIAS}.prompts")
+    retrievers = importlib.import_module(f"{LLM_ALIAS}.retrievers")
+
+    # The services log every embedding batch and request at INFO.
+    for module in (semantic, pali.api, llm_service, retrievers):
+        module.logger.setLevel(logging.WARNING)
+
+    translate_client = FakeTranslationServiceClient(latency.translate_ms)
+    genai_client = FakeGenaiClient(latency.genai_ms)
+    embedding_model_cls = FakeTextEmbeddingModel.with_latency(0.0)
+    semantic.TextEmbeddingModel = embedding_model_cls
+    semantic.vertex_init = lambda **kwargs: None
+    retrievers._translate_client = translate_client
+    llm_service._get_client = lambda: genai_client
+
+    index_path, metadata_path = semantic.INDEX_PATH, semantic.METADATA_PATH
+    if not (index_path.exists() and metadata_path.exists()) and index_dir is not None:
+        index_path, metadata_path = index_dir / index_path.name, index_dir / metadata_path.name
+    index, _ = semantic._ensure_index(
+        project=BENCH_PROJECT,
+        location="us-central1",
+        model_name="text-embedding-004",
+        index_path=index_path,
+        metadata_path=metadata_path,
+    )
+    # A real index on disk may come from a model with a different dimension.
+    embedding_model_cls.dim = index.d
+    # Warm the model cache the same way the first /search/semantic call would.
+    semantic.semantic_definition_search("warmup", k=1)
+    embedding_model_cls.latency_ms = latency.embed_ms
+
+    return Services(
+        pali=pali,
+        lookup=lookup,
+        semantic=semantic,
+        llm_service=llm_service,
+        prompts=prompts,
+        retrievers=retrievers,
+        embedding_model_cls=embedding_model_cls,
+        translate_client=translate_client,
+        genai_client=genai_client,
+    )
+
+
+def summarize(latencies_s: List[float], wall_s: float | None = None, errors: int = 0) -> Dict[str, float]:
+    """
+    Summarize per-call latencies (seconds) into millisecond percentiles and throughput.
+    """
+    samples = sorted(latencies_s)
+    count = len(samples)
+    if count >= 2:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = samples[0] if samples else 0.0
+    wall = wall_s if wall_s is not None else sum(samples)
+    return {
+        "count": count,
+        "errors": errors,
+        "mean_ms": 1000 * statistics.fmean(samples) if samples else 0.0,
+        "p50_ms": 1000 * p50,
+        "p95_ms": 1000 * p95,
+        "p99_ms": 1000 * p99,
+        "max_ms": 1000 * samples[-1] if samples else 0.0,
+        "throughput_per_s": (count - errors) / wall if wall > 0 else 0.0,
+    }
+
+
+def time_calls(fn: Callable[[], object], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, wall_s=time.perf_counter() - start)
@@ -0,0 +1,122 @@
+"""
+Concurrent HTTP load generator for the Pali lookup and LLM generation services.
+"""
+from __future__ import annotations
+
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import requests
+import uvicorn
+
+from .harness import summarize
+
+THAI_QUERIES = ["ธรรม", "พุทธ", "สุข", "ปัญญา", "เมตตา", "ศีล", "บุญ", "กุศล"]
+ENGLISH_QUERIES = ["health", "wealth", "wisdom", "peace", "protection", "success", "family", "merit"]
+WISH_SETS = [
+    ["ขอให้สุขภาพแข็งแรง"],
+    ["ขอให้ร่ำรวย", "ขอให้สอบผ่าน"],
+    ["ขอให้ครอบครัวมีความสุข", "ขอให้สุขภาพแข็งแรง"],
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(app: object, port: int | None = None) -> Iterator[str]:
+    """
+    Run ``app`` with uvicorn in a background thread and yield its base URL.
+    """
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError(f"uvicorn failed to start on port {port}")
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+RequestFn = Callable[[requests.Session, random.Random], requests.Response]
+
+
+def pali_scenarios(base_url: str) -> Dict[str, RequestFn]:
+    return {
+        "pali_search": lambda session, rng: session.get(
+            f"{base_url}/search", params={"q": rng.choice(THAI_QUERIES), "limit": 5}
+        ),
+        "pali_suggest": lambda session, rng: session.get(
+            f"{base_url}/suggest", params={"q": rng.choice(THAI_QUERIES)[: rng.randint(1, 3)], "limit": 8}
+        ),
+        "pali_search_semantic": lambda session, rng: session.get(
+            f"{base_url}/search/semantic", params={"q": rng.choice(ENGLISH_QUERIES), "limit": 5}
+        ),
+    }
+
+
+def llm_scenarios(base_url: str) -> Dict[str, RequestFn]:
+    return {
+        "llm_generate": lambda session, rng: session.post(
+            f"{base_url}/generate", json={"name": "สมชาย", "wishes": rng.choice(WISH_SETS), "retrieve": True}
+        ),
+    }
+
+
+def drive(request_fn: RequestFn, requests_total: int, concurrency: int, seed: int = 0) -> Dict[str, float]:
+    """
+    Issue ``requests_total`` requests from ``concurrency`` workers and summarize latency.
+    Non-2xx responses and transport errors count as errors.
+    """
+    local = threading.local()
+
+    def _one(i: int) -> Tuple[float, bool]:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        rng = random.Random(seed + i)
+        t0 = time.perf_counter()
+        try:
+            ok = request_fn(session, rng).ok
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - t0, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(_one, range(requests_total)))
+    wall = time.perf_counter() - start
+
+    latencies: List[float] = [latency for latency, _ in outcomes]
+    errors = sum(1 for _, ok in outcomes if not ok)
+    stats = summarize(latencies, wall_s=wall, errors=errors)
+    stats["concurrency"] = concurrency
+    return stats
+
+
+def run_load(
+    scenarios: Dict[str, RequestFn],
+    requests_total: int,
+    concurrency: int,
+    seed: int = 0,
+) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, request_fn in scenarios.items():
+        # One untimed request so lazy model/index loading is not measured.
+        request_fn(requests.Session(), random.Random(seed))
+        results[name] = drive(request_fn, requests_total, concurrency, seed=seed)
+    return results
@@ -0,0 +1,85 @@
+"""
+Micro-benchmarks for the hot paths of dictionary lookup, autocomplete, embedding, FAISS search and prompt building.
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict
+
+import numpy as np
+
+from .harness import Services, time_calls
+
+WISHES = ["ขอให้สุขภาพแข็งแรง", "ขอให้ร่ำรวย", "ขอให้สอบผ่าน", "ขอให้ครอบครัวมีความสุข"]
+
+
+def run_micro(
+    services: Services,
+    iterations: int = 200,
+    seed: int = 0,
+    pali_url: str | None = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time each hot path. With ``pali_url``, also time ``build_user_prompt`` doing real
+    retrieval over HTTP (Gemini is not involved).
+    """
+    rng = random.Random(seed)
+    lookup = services.lookup
+    semantic = services.semantic
+    prompts = services.prompts
+
+    headwords = lookup._dictionary["headword_thai"].dropna().astype(str).tolist()
+    queries = [rng.choice(headwords) for _ in range(64)]
+    query_iter = iter(queries * (iterations // len(queries) + 2))
+
+    prefixes = [query[: rng.randint(1, 4)] for query in queries]
+    prefix_iter = iter(prefixes * (iterations // len(prefixes) + 2))
+
+    model = semantic._model_cache[1] if semantic._model_cache else None
+    index, metadata = semantic._index_cache, semantic._metadata_cache
+    definitions = [entry["definition"] for entry in metadata or []][:64]
+
+    results: Dict[str, Dict[str, float]] = {}
+
+    results["character_similarity"] = time_calls(
+        lambda: lookup.character_similarity(next(query_iter), limit=5), iterations
+    )
+
+    results["prefix_suggestions"] = time_calls(
+        lambda: lookup.prefix_suggestions(next(prefix_iter), limit=8), iterations
+    )
+
+    if model is not None and definitions:
+        # Each call embeds 64 texts in batches of 32, i.e. two model round trips.
+        results["_embed_texts"] = time_calls(
+            lambda: semantic._embed_texts(definitions, model=model, batch_size=32),
+            max(1, iterations // 10),
+            warmup=1,
+        )
+
+    if index is not None:
+        np_rng = np.random.default_rng(seed)
+        query_vecs = semantic._normalize(np_rng.standard_normal((iterations + 8, index.d), dtype=np.float32))
+        vec_iter = iter(query_vecs)
+        results["index.search"] = time_calls(lambda: index.search(next(vec_iter)[None, :], 5), iterations)
+
+    wish_context = {
+        wish: [wish, *(f"related:{wish}:{i}" for i in range(10))] for wish in WISHES
+    }
+    results["build_user_prompt_cached_context"] = time_calls(
+        lambda: prompts.build_user_prompt("สมชาย", WISHES, retrieve=True, wish_context=wish_context),
+        iterations,
+    )
+    if pali_url is not None:
+        services.retrievers.PALI_API_URL = pali_url
+        # Two Pali API calls plus one translation per Thai wish.
+        results["build_user_prompt_retrieval"] = time_calls(
+            lambda: prompts.build_user_prompt("สมชาย", WISHES, retrieve=True),
+            max(1, iterations // 10),
+            warmup=1,
+        )
+    results["build_user_prompt_no_retrieve"] = time_calls(
+        lambda: prompts.build_user_prompt("สมชาย", WISHES, retrieve=False),
+        iterations,
+    )
+    return results
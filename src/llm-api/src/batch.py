@@ -0,0 +1,330 @@
+"""
+Bulk chant generation with shared retrieval, bounded concurrency and resumable JSONL output.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
+
+from .prompts import fetch_wish_context
+
+logger = logging.getLogger(__name__)
+
+GenerateFn = Callable[[str, list[str], dict[str, list[str]]], str]
+
+
+@dataclass
+class BatchItem:
+    id: str
+    name: str
+    wishes: list[str]
+
+
+@dataclass
+class BatchStats:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+
+class RateLimiter:
+    """
+    Spaces calls evenly so that at most ``requests_per_minute`` start per minute.
+    A ``None`` rate disables limiting.
+    """
+
+    def __init__(self, requests_per_minute: float | None) -> None:
+        self._interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _content_id(name: str, wishes: list[str], occurrence: int) -> str:
+    payload = json.dumps([name, wishes, occurrence], ensure_ascii=False)
+    return f"auto-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _validate_record(record: object, where: str) -> tuple[str | None, str, list[str]]:
+    """
+    Validate one ``{"id"?, "name", "wishes"}`` record and return its id (``None`` when
+    absent), name and wishes. ``where`` prefixes error messages.
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"{where}: record must be a JSON object")
+    name = record.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError(f"{where}: name is required")
+    wishes = record.get("wishes")
+    if not isinstance(wishes, list) or not all(isinstance(wish, str) for wish in wishes):
+        raise ValueError(f"{where}: wishes must be a list of strings")
+    wishes = [wish.strip() for wish in wishes if wish.strip()]
+    if not wishes:
+        raise ValueError(f"{where}: wishes must contain at least one non-empty item")
+    item_id = None
+    if "id" in record:
+        item_id = record["id"]
+        if isinstance(item_id, bool) or not isinstance(item_id, (str, int)) or not str(item_id).strip():
+            raise ValueError(f"{where}: id must be a non-empty string or integer")
+        item_id = str(item_id).strip()
+    return item_id, name.strip(), wishes
+
+
+def parse_batch_records(records: Iterable[tuple[str, object]]) -> list[BatchItem]:
+    """
+    Validate ``(where, record)`` pairs and reject duplicate explicit ids.
+
+    Records without an ``id`` are keyed by a hash of their name, wishes and how many
+    identical records came before them, so the resume key does not depend on where a
+    record sits in the input and repeated records each get their own id.
+    """
+    items: list[BatchItem] = []
+    seen: set[str] = set()
+    occurrences: Counter[str] = Counter()
+    for where, record in records:
+        item_id, name, wishes = _validate_record(record, where)
+        if item_id is None:
+            content = json.dumps([name, wishes], ensure_ascii=False)
+            item_id = _content_id(name, wishes, occurrences[content])
+            occurrences[content] += 1
+        if item_id in seen:
+            raise ValueError(f"{where}: duplicate id {item_id!r}")
+        seen.add(item_id)
+        items.append(BatchItem(id=item_id, name=name, wishes=wishes))
+    return items
+
+
+def read_batch_items(input_path: Path) -> list[BatchItem]:
+    """
+    Parse a JSONL file of ``{"id"?, "name", "wishes"}`` records.
+    """
+
+    def _records() -> Iterator[tuple[str, object]]:
+        with Path(input_path).open(encoding="utf-8") as fh:
+            for line_no, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"{input_path}:{line_no}: invalid JSON ({exc})") from exc
+                yield f"{input_path}:{line_no}", record
+
+    return parse_batch_records(_records())
+
+
+def write_batch_items(items: list[BatchItem], path: Path) -> None:
+    """
+    Write ``items`` as JSONL that ``read_batch_items`` reads back with the same ids.
+    """
+    with Path(path).open("w", encoding="utf-8") as fh:
+        for item in items:
+            record = {"id": item.id, "name": item.name, "wishes": item.wishes}
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def completed_ids(output_path: Path) -> set[str]:
+    """
+    Return ids that already have a successful result in ``output_path``.
+    A partially written trailing line (e.g. after a crash) is ignored.
+    """
+    path = Path(output_path)
+    if not path.exists():
+        return set()
+    done: set[str] = set()
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Ignoring unreadable line in %s", path)
+                continue
+            if isinstance(record, dict) and "output" in record and "id" in record:
+                done.add(str(record["id"]))
+    return done
+
+
+def _safe_wish_context(wish: str) -> list[str] | None:
+    try:
+        return fetch_wish_context(wish)
+    except Exception:
+        logger.exception("Retrieval failed for wish %r", wish)
+        return None
+
+
+def prefetch_wish_context(
+    wishes: list[str],
+    concurrency: int,
+    on_fetched: Callable[[str, list[str]], None] | None = None,
+) -> dict[str, list[str]]:
+    """
+    Fetch retrieval context once per distinct wish, calling ``on_fetched`` for each as it
+    arrives. Wishes whose retrieval fails are left out, so prompt building retries them
+    for the items that need them.
+    """
+    unique = list(dict.fromkeys(wishes))
+    logger.info("Prefetching retrieval for %d distinct wish(es)", len(unique))
+    context: dict[str, list[str]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for wish, result in zip(unique, pool.map(_safe_wish_context, unique)):
+            if result is not None:
+                context[wish] = result
+                if on_fetched is not None:
+                    on_fetched(wish, result)
+    return context
+
+
+def load_wish_context(context_path: Path) -> dict[str, list[str]]:
+    """
+    Read a ``{"wish", "context"}`` JSONL cache written by ``run_batch``, skipping torn lines.
+    """
+    path = Path(context_path)
+    context: dict[str, list[str]] = {}
+    if not path.exists():
+        return context
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if (
+                isinstance(record, dict)
+                and isinstance(record.get("wish"), str)
+                and isinstance(record.get("context"), list)
+            ):
+                context[record["wish"]] = record["context"]
+    return context
+
+
+def _ends_mid_line(path: Path) -> bool:
+    with path.open("rb") as fh:
+        fh.seek(0, 2)
+        if fh.tell() == 0:
+            return False
+        fh.seek(-1, 2)
+        return fh.read(1) != b"\n"
+
+
+def sidecar_path(output_path: Path, kind: str) -> Path:
+    """
+    Return the ``<stem>.<kind>.jsonl`` file kept next to ``output_path``.
+    """
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.{kind}.jsonl")
+
+
+def _open_append(path: Path, stack: ExitStack) -> TextIO:
+    fh = stack.enter_context(path.open("a", encoding="utf-8"))
+    if _ends_mid_line(path):
+        fh.write("\n")
+    return fh
+
+
+def run_batch(
+    items: list[BatchItem],
+    output_path: Path,
+    generate: GenerateFn,
+    *,
+    errors_path: Path | None = None,
+    context_path: Path | None = None,
+    retrieve: bool = True,
+    concurrency: int = 4,
+    requests_per_minute: float | None = None,
+    chunk_size: int = 64,
+    stats: BatchStats | None = None,
+) -> BatchStats:
+    """
+    Generate a chant for every item not yet completed in ``output_path``, appending one
+    JSON line per success as soon as it is ready, so ``output_path`` holds exactly one
+    record per succeeded id. Failures go to ``errors_path`` (default
+    ``<stem>.errors.jsonl``), which each run rewrites, so it lists the items the latest
+    run could not generate; those are retried on the next run.
+
+    Pending items are processed ``chunk_size`` at a time: retrieval for a chunk's new
+    wishes, then generation, so results start flowing before all retrieval is done.
+    Retrieved context is appended to ``context_path`` (default ``<stem>.context.jsonl``)
+    and reloaded on resume, so each wish is retrieved once even across crashes.
+    """
+    stats = stats or BatchStats()
+    output_path = Path(output_path)
+    errors_path = Path(errors_path) if errors_path else sidecar_path(output_path, "errors")
+    context_path = Path(context_path) if context_path else sidecar_path(output_path, "context")
+    done = completed_ids(output_path)
+    pending = [item for item in items if item.id not in done]
+    stats.total = len(items)
+    stats.skipped = len(items) - len(pending)
+    logger.info("Batch: %d item(s), %d already done, %d pending", stats.total, stats.skipped, len(pending))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    errors_path.parent.mkdir(parents=True, exist_ok=True)
+    if not pending:
+        errors_path.write_text("", encoding="utf-8")
+        return stats
+
+    wish_context = load_wish_context(context_path) if retrieve else {}
+    limiter = RateLimiter(requests_per_minute)
+
+    def _run(item: BatchItem) -> dict[str, object]:
+        limiter.acquire()
+        try:
+            output = generate(item.name, item.wishes, wish_context)
+        except Exception as exc:
+            logger.exception("Generation failed for id %r", item.id)
+            return {"id": item.id, "name": item.name, "error": str(exc)}
+        return {"id": item.id, "name": item.name, "output": output}
+
+    with ExitStack() as stack:
+        out = _open_append(output_path, stack)
+        errors = stack.enter_context(errors_path.open("w", encoding="utf-8"))
+        context_file = _open_append(context_path, stack) if retrieve else None
+
+        def _save_context(wish: str, context: list[str]) -> None:
+            context_file.write(json.dumps({"wish": wish, "context": context}, ensure_ascii=False) + "\n")
+            context_file.flush()
+
+        pool = stack.enter_context(ThreadPoolExecutor(max_workers=concurrency))
+        for start in range(0, len(pending), max(1, chunk_size)):
+            chunk = pending[start : start + max(1, chunk_size)]
+            if retrieve:
+                missing = [wish for item in chunk for wish in item.wishes if wish not in wish_context]
+                if missing:
+                    # Generation of the previous chunk has finished, so workers are not reading.
+                    wish_context.update(prefetch_wish_context(missing, concurrency, on_fetched=_save_context))
+            for future in as_completed([pool.submit(_run, item) for item in chunk]):
+                record = future.result()
+                ok = "output" in record
+                target = out if ok else errors
+                target.write(json.dumps(record, ensure_ascii=False) + "\n")
+                target.flush()
+                stats.record(ok)
+    logger.info("Batch finished: %d succeeded, %d failed", stats.succeeded, stats.failed)
+    return stats
@@ -14,15 +14,30 @@ TRANSLATION{{เพราะเหตุอย่างนี้ๆ พระผ
 ```
 Here is the user's information:\n"""
 
-def build_user_prompt(name: str, wishes: list[str], retrieve: bool = True) -> str:
+def fetch_wish_context(wish: str, top_k: int = 5) -> list[str]:
+    """Return the wish followed by its semantic and similarity retrieval results."""
+    semantics_results = fetch_words_semantics(wish, top_k=top_k)
+    similarity_results = fetch_words_simiarlity(wish, top_k=top_k)
+    return [wish, *semantics_results, *similarity_results]
+
+
+def build_user_prompt(
+    name: str,
+    wishes: list[str],
+    retrieve: bool = True,
+    wish_context: dict[str, list[str]] | None = None,
+) -> str:
+    """
+    Build the user prompt. When ``wish_context`` is given, retrieval results are
+    taken from it instead of being fetched, so callers can share them across prompts.
+    """
     if retrieve:
         enhanced_wishes = []
         for wish in wishes:
-            semantics_results = fetch_words_semantics(wish, top_k=5)
-            similarity_results = fetch_words_simiarlity(wish, top_k=5)
-            enhanced_wishes.append(wish)
-            enhanced_wishes.extend(semantics_results)
-            enhanced_wishes.extend(similarity_results)
+            if wish_context is not None and wish in wish_context:
+                enhanced_wishes.extend(wish_context[wish])
+            else:
+                enhanced_wishes.extend(fetch_wish_context(wish))
         wishes = str(enhanced_wishes)
     template = "Name: {name}\nWishes:\n{wishes_text}\n"
     user_info = template.format(name=name, wishes_text=wishes)
@@ -6,7 +6,7 @@ from google.cloud import translate
 from dotenv import load_dotenv
 load_dotenv()
 
-PALI_API_URL = "http://0.0.0.0:8081"
+PALI_API_URL = os.getenv("PALI_API_URL", "http://0.0.0.0:8081")
 THAI_BLOCK_START = "\u0e00"
 THAI_BLOCK_END = "\u0e7f"
 
@@ -1,14 +1,29 @@
+import argparse
+import json
 import logging
 import os
+import re
+import threading
+import uuid
 from functools import lru_cache
 from pathlib import Path
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.responses import FileResponse
 from google import genai
 from google.genai import types
 from pydantic import BaseModel, Field
 
+from .batch import (
+    BatchItem,
+    BatchStats,
+    completed_ids,
+    parse_batch_records,
+    read_batch_items,
+    run_batch,
+    write_batch_items,
+)
 from .prompts import SYSTEM_PROMPT, build_user_prompt
 
 logger = logging.getLogger(__name__)
@@ -37,6 +52,11 @@ def _load_environment() -> None:
 _load_environment()
 
 DEFAULT_MODEL = "gemini-3-flash-preview"
+# Batch job inputs, settings and results live under BATCH_JOBS_DIR/<job_id>/.
+BATCH_JOBS_DIR = Path(
+    os.getenv("BATCH_JOBS_DIR") or (_find_repo_root(Path(__file__).resolve().parent) or Path.cwd()) / "batch_jobs"
+)
+_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
 
 
 class GenerateRequest(BaseModel):
@@ -51,6 +71,27 @@ class GenerateResponse(BaseModel):
     output: str
 
 
+class BatchJobSettings(BaseModel):
+    retrieve: bool = Field(True, description="Enable semantic/similarity retrieval")
+    model: str = Field(DEFAULT_MODEL, description="Gemini model name")
+    concurrency: int = Field(4, ge=1, le=64, description="Maximum concurrent retrieval/Gemini calls")
+    requests_per_minute: float | None = Field(None, gt=0, description="Gemini call rate limit")
+
+
+class BatchGenerateRequest(BatchJobSettings):
+    records: list[dict] = Field(..., min_length=1, description="{id?, name, wishes} records to generate for")
+
+
+class BatchJobResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
+    skipped: int
+    succeeded: int
+    failed: int
+    error: str | None = None
+
+
 app = FastAPI(title="Chant LLM Generator")
 
 
@@ -68,8 +109,14 @@ def _get_client() -> genai.Client:
     return _client(project, location)
 
 
-def generate_chant(name: str, wishes: list[str], retrieve: bool, model: str) -> str:
-    user_prompt = build_user_prompt(name, wishes, retrieve=retrieve)
+def generate_chant(
+    name: str,
+    wishes: list[str],
+    retrieve: bool,
+    model: str,
+    wish_context: dict[str, list[str]] | None = None,
+) -> str:
+    user_prompt = build_user_prompt(name, wishes, retrieve=retrieve, wish_context=wish_context)
     client = _get_client()
     response = client.models.generate_content(
         model=model,
@@ -101,3 +148,210 @@ def generate(request: GenerateRequest) -> GenerateResponse:
         logger.exception("LLM generation failed")
         raise HTTPException(status_code=500, detail="LLM generation failed") from exc
     return GenerateResponse(model=request.model, output=output)
+
+
+class _BatchJob:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.status = "pending"
+        self.error: str | None = None
+        self.stats = BatchStats()
+
+    def to_response(self) -> BatchJobResponse:
+        return BatchJobResponse(
+            job_id=self.job_id,
+            status=self.status,
+            total=self.stats.total,
+            skipped=self.stats.skipped,
+            succeeded=self.stats.succeeded,
+            failed=self.stats.failed,
+            error=self.error,
+        )
+
+
+_batch_jobs: dict[str, _BatchJob] = {}
+_batch_jobs_lock = threading.Lock()
+
+
+def run_batch_job(
+    items: list[BatchItem],
+    output_path: str,
+    *,
+    retrieve: bool,
+    model: str,
+    concurrency: int,
+    requests_per_minute: float | None,
+    errors_path: str | None = None,
+    context_path: str | None = None,
+    stats: BatchStats | None = None,
+) -> BatchStats:
+    def _generate(name: str, wishes: list[str], wish_context: dict[str, list[str]]) -> str:
+        return generate_chant(name, wishes, retrieve, model, wish_context=wish_context)
+
+    return run_batch(
+        items,
+        Path(output_path),
+        _generate,
+        errors_path=Path(errors_path) if errors_path else None,
+        context_path=Path(context_path) if context_path else None,
+        retrieve=retrieve,
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+        stats=stats,
+    )
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    records = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+def _job_dir(job_id: str) -> Path:
+    job_dir = BATCH_JOBS_DIR / job_id
+    if not _JOB_ID_RE.fullmatch(job_id) or not job_dir.is_dir():
+        raise HTTPException(status_code=404, detail="job not found")
+    return job_dir
+
+
+def _execute_batch_job(job: _BatchJob, job_dir: Path, settings: BatchJobSettings) -> None:
+    job.status = "running"
+    try:
+        run_batch_job(
+            read_batch_items(job_dir / "input.jsonl"),
+            str(job_dir / "output.jsonl"),
+            retrieve=settings.retrieve,
+            model=settings.model,
+            concurrency=settings.concurrency,
+            requests_per_minute=settings.requests_per_minute,
+            errors_path=str(job_dir / "errors.jsonl"),
+            context_path=str(job_dir / "context.jsonl"),
+            stats=job.stats,
+        )
+    except Exception as exc:
+        logger.exception("Batch job %s failed", job.job_id)
+        job.status = "failed"
+        job.error = str(exc)
+        return
+    job.status = "completed"
+
+
+def _start_batch_job(
+    job_id: str,
+    job_dir: Path,
+    settings: BatchJobSettings,
+    background_tasks: BackgroundTasks,
+) -> _BatchJob:
+    with _batch_jobs_lock:
+        existing = _batch_jobs.get(job_id)
+        if existing is not None and existing.status in ("pending", "running"):
+            raise HTTPException(status_code=409, detail=f"job {job_id} is already running")
+        job = _BatchJob(job_id)
+        _batch_jobs[job_id] = job
+    background_tasks.add_task(_execute_batch_job, job, job_dir, settings)
+    return job
+
+
+@app.post("/generate/batch", response_model=BatchJobResponse, status_code=202)
+def generate_batch(request: BatchGenerateRequest, background_tasks: BackgroundTasks) -> BatchJobResponse:
+    """
+    Start a background batch job over the records in the request body.
+    """
+    try:
+        items = parse_batch_records((f"records[{i}]", record) for i, record in enumerate(request.records))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    job_id = uuid.uuid4().hex
+    job_dir = BATCH_JOBS_DIR / job_id
+    job_dir.mkdir(parents=True)
+    write_batch_items(items, job_dir / "input.jsonl")
+    settings = BatchJobSettings(**request.model_dump(exclude={"records"}))
+    (job_dir / "settings.json").write_text(settings.model_dump_json())
+    return _start_batch_job(job_id, job_dir, settings, background_tasks).to_response()
+
+
+@app.post("/generate/batch/{job_id}/resume", response_model=BatchJobResponse, status_code=202)
+def resume_batch(job_id: str, background_tasks: BackgroundTasks) -> BatchJobResponse:
+    """
+    Restart a job (e.g. after a crash); records that already succeeded are skipped.
+    """
+    job_dir = _job_dir(job_id)
+    settings = BatchJobSettings.model_validate_json((job_dir / "settings.json").read_text())
+    return _start_batch_job(job_id, job_dir, settings, background_tasks).to_response()
+
+
+@app.get("/generate/batch/{job_id}", response_model=BatchJobResponse)
+def get_batch_job(job_id: str) -> BatchJobResponse:
+    job_dir = _job_dir(job_id)
+    job = _batch_jobs.get(job_id)
+    if job is not None:
+        return job.to_response()
+    # Not started by this process (e.g. the service restarted); report progress from disk.
+    ids = {item.id for item in read_batch_items(job_dir / "input.jsonl")}
+    done = ids & completed_ids(job_dir / "output.jsonl")
+    failed = (ids - done) & {record["id"] for record in _read_jsonl(job_dir / "errors.jsonl")}
+    return BatchJobResponse(
+        job_id=job_id,
+        status="completed" if len(done) == len(ids) else "interrupted",
+        total=len(ids),
+        skipped=0,
+        succeeded=len(done),
+        failed=len(failed),
+    )
+
+
+@app.get("/generate/batch/{job_id}/results")
+def get_batch_results(job_id: str) -> FileResponse:
+    """
+    Download the job's successes as JSONL, exactly one ``{id, name, output}`` line per id.
+    """
+    output_path = _job_dir(job_id) / "output.jsonl"
+    if not output_path.exists():
+        raise HTTPException(status_code=404, detail="no results yet")
+    return FileResponse(output_path, media_type="application/x-ndjson", filename=f"{job_id}.jsonl")
+
+
+@app.get("/generate/batch/{job_id}/errors")
+def get_batch_errors(job_id: str) -> FileResponse:
+    """
+    Download ``{id, name, error}`` lines for items the latest run failed; resuming retries them.
+    """
+    errors_path = _job_dir(job_id) / "errors.jsonl"
+    if not errors_path.exists():
+        raise HTTPException(status_code=404, detail="no errors recorded yet")
+    return FileResponse(errors_path, media_type="application/x-ndjson", filename=f"{job_id}.errors.jsonl")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate chants in bulk from a JSONL file of {id?, name, wishes}.")
+    parser.add_argument("input", help="Input JSONL path")
+    parser.add_argument(
+        "output", help="Output JSONL for successes (failures go to <stem>.errors.jsonl); rerun to resume"
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Gemini model name")
+    parser.add_argument("--no-retrieve", action="store_true", help="Disable semantic/similarity retrieval")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent retrieval/Gemini calls")
+    parser.add_argument("--rpm", type=float, default=None, help="Gemini requests per minute limit")
+    args = parser.parse_args()
+
+    items = read_batch_items(Path(args.input))
+    stats = run_batch_job(
+        items,
+        args.output,
+        retrieve=not args.no_retrieve,
+        model=args.model,
+        concurrency=max(1, args.concurrency),
+        requests_per_minute=args.rpm,
+    )
+    print(f"total={stats.total} skipped={stats.skipped} succeeded={stats.succeeded} failed={stats.failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import json
+
+import pytest
+
+from src import batch
+from src.batch import BatchItem, read_batch_items, run_batch
+
+
+def _write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    ("line", "message"),
+    [
+        ('{"name": "a", "wishes": "health"}', "wishes must be a list of strings"),
+        ('{"name": "a", "wishes": ["ok", 3]}', "wishes must be a list of strings"),
+        ('["a"]', "record must be a JSON object"),
+        ('{"id": null, "name": "a", "wishes": ["ok"]}', "id must be a non-empty string or integer"),
+        ('{"name": " ", "wishes": ["ok"]}', "name is required"),
+        ('{"name": "a", "wishes": [" "]}', "wishes must contain at least one non-empty item"),
+    ],
+)
+def test_read_batch_items_rejects_invalid_records(tmp_path, line, message):
+    path = tmp_path / "in.jsonl"
+    _write_lines(path, [line])
+    with pytest.raises(ValueError, match=message):
+        read_batch_items(path)
+
+
+def test_read_batch_items_ids_do_not_depend_on_line_position(tmp_path):
+    first = tmp_path / "first.jsonl"
+    second = tmp_path / "second.jsonl"
+    a = '{"name": "a", "wishes": ["health"]}'
+    b = '{"name": "b", "wishes": ["wealth"]}'
+    _write_lines(first, [a, b])
+    _write_lines(second, ['{"id": 1, "name": "c", "wishes": ["peace"]}', b, a])
+
+    ids_first = {item.name: item.id for item in read_batch_items(first)}
+    ids_second = {item.name: item.id for item in read_batch_items(second)}
+    assert ids_first["a"] == ids_second["a"]
+    assert ids_first["b"] == ids_second["b"]
+    assert ids_second["c"] == "1"
+
+
+def test_read_batch_items_gives_identical_records_without_id_distinct_stable_ids(tmp_path):
+    first = tmp_path / "first.jsonl"
+    second = tmp_path / "second.jsonl"
+    same = '{"name": "สมชาย", "wishes": ["health"]}'
+    other = '{"name": "b", "wishes": ["wealth"]}'
+    _write_lines(first, [same, same, other])
+    _write_lines(second, [other, same, same])
+
+    ids_first = [item.id for item in read_batch_items(first)]
+    ids_second = [item.id for item in read_batch_items(second)]
+    assert len(set(ids_first)) == 3
+    assert set(ids_first) == set(ids_second)
+
+
+def test_read_batch_items_rejects_duplicate_ids(tmp_path):
+    path = tmp_path / "in.jsonl"
+    _write_lines(path, ['{"id": "x", "name": "a", "wishes": ["w"]}', '{"id": "x", "name": "b", "wishes": ["w"]}'])
+    with pytest.raises(ValueError, match="duplicate id 'x'"):
+        read_batch_items(path)
+
+
+def test_run_batch_resumes_after_crash_and_retries_failures(tmp_path, monkeypatch):
+    retrieved = []
+    monkeypatch.setattr(batch, "fetch_wish_context", lambda wish: retrieved.append(wish) or [wish, "ctx"])
+    items = [
+        BatchItem(id="ok-1", name="a", wishes=["health", "wealth"]),
+        BatchItem(id="ok-2", name="b", wishes=["health"]),
+        BatchItem(id="flaky", name="c", wishes=["peace"]),
+    ]
+    output = tmp_path / "out" / "results.jsonl"
+    failing = {"flaky"}
+
+    def generate(name, wishes, wish_context):
+        if name == "c" and "flaky" in failing:
+            raise RuntimeError("quota exceeded")
+        return "|".join(wish_context[wish][1] for wish in wishes)
+
+    errors = output.with_name("results.errors.jsonl")
+
+    stats = run_batch(items, output, generate, concurrency=2)
+    assert (stats.total, stats.skipped, stats.succeeded, stats.failed) == (3, 0, 2, 1)
+    assert sorted(retrieved) == ["health", "peace", "wealth"]
+    assert batch.completed_ids(output) == {"ok-1", "ok-2"}
+    assert "error" not in output.read_text(encoding="utf-8")
+    assert json.loads(errors.read_text(encoding="utf-8")) == {"id": "flaky", "name": "c", "error": "quota exceeded"}
+
+    # Simulate a crash halfway through writing a line.
+    with output.open("a", encoding="utf-8") as fh:
+        fh.write('{"id": "ok-3", "outp')
+
+    failing.clear()
+    retrieved.clear()
+    stats = run_batch(items, output, generate, concurrency=2)
+    assert (stats.total, stats.skipped, stats.succeeded, stats.failed) == (3, 2, 1, 0)
+    # Context fetched before the failure is reused from the saved cache.
+    assert retrieved == []
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    # The torn line is left in place but terminated, so the retried result is readable.
+    assert lines[-2] == '{"id": "ok-3", "outp'
+    assert json.loads(lines[-1]) == {"id": "flaky", "name": "c", "output": "ctx"}
+    assert batch.completed_ids(output) == {"ok-1", "ok-2", "flaky"}
+    assert errors.read_text(encoding="utf-8") == ""
+
+    stats = run_batch(items, output, generate, concurrency=2)
+    assert (stats.total, stats.skipped, stats.succeeded, stats.failed) == (3, 3, 0, 0)
+
+
+def test_run_batch_feeds_generation_per_chunk_and_reuses_saved_context(tmp_path, monkeypatch):
+    retrieved = []
+    monkeypatch.setattr(batch, "fetch_wish_context", lambda wish: retrieved.append(wish) or [wish, "ctx"])
+    items = [BatchItem(id=str(i), name=f"n{i}", wishes=[f"w{i}", "shared"]) for i in range(4)]
+    output = tmp_path / "results.jsonl"
+    seen_at_generation = {}
+
+    def generate(name, wishes, wish_context):
+        seen_at_generation[name] = set(retrieved)
+        if name == "n3":
+            raise RuntimeError("crash")
+        return "ok"
+
+    run_batch(items, output, generate, concurrency=1, chunk_size=2)
+    # The first chunk is generated before retrieval for the second chunk starts.
+    assert seen_at_generation["n0"] == {"w0", "w1", "shared"}
+    assert sorted(retrieved) == ["shared", "w0", "w1", "w2", "w3"]
+    assert set(batch.load_wish_context(output.with_name("results.context.jsonl"))) == set(retrieved)
+
+    retrieved.clear()
+    stats = run_batch(items, output, generate, concurrency=1, chunk_size=2)
+    assert (stats.skipped, stats.failed) == (3, 1)
+    assert retrieved == []
+
+
+def test_batch_endpoint_keeps_job_files_under_jobs_dir_and_resumes(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from src import service
+
+    monkeypatch.setattr(service, "BATCH_JOBS_DIR", tmp_path)
+    failing = {"b"}
+
+    def generate_chant(name, wishes, retrieve, model, wish_context=None):
+        if name in failing:
+            raise RuntimeError("quota exceeded")
+        return f"chant for {name}"
+
+    monkeypatch.setattr(service, "generate_chant", generate_chant)
+    client = TestClient(service.app)
+
+    bad = client.post("/generate/batch", json={"records": [{"name": "a", "wishes": "health"}]})
+    assert bad.status_code == 400
+    assert "records[0]: wishes must be a list of strings" in bad.json()["detail"]
+
+    records = [{"name": "a", "wishes": ["health"]}, {"id": "b", "name": "b", "wishes": ["wealth"]}]
+    started = client.post("/generate/batch", json={"records": records, "retrieve": False})
+    assert started.status_code == 202
+    job_id = started.json()["job_id"]
+    assert (tmp_path / job_id / "input.jsonl").exists()
+
+    status = client.get(f"/generate/batch/{job_id}").json()
+    assert (status["status"], status["succeeded"], status["failed"]) == ("completed", 1, 1)
+    errors = client.get(f"/generate/batch/{job_id}/errors")
+    assert [json.loads(line)["id"] for line in errors.text.splitlines()] == ["b"]
+
+    failing.clear()
+    resumed = client.post(f"/generate/batch/{job_id}/resume")
+    assert resumed.status_code == 202
+    status = client.get(f"/generate/batch/{job_id}").json()
+    assert (status["skipped"], status["succeeded"], status["failed"]) == (1, 1, 0)
+
+    results = client.get(f"/generate/batch/{job_id}/results")
+    outputs = {line["id"]: line["output"] for line in map(json.loads, results.text.splitlines())}
+    assert len(results.text.splitlines()) == 2
+    assert outputs["b"] == "chant for b"
+    assert client.get(f"/generate/batch/{job_id}/errors").text == ""
+    assert client.get("/generate/batch/../../etc/results").status_code == 404
+    assert client.get(f"/generate/batch/{'0' * 32}").status_code == 404
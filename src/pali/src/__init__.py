@@ -1,5 +1,5 @@
 from .api import app
-from .lookup import character_similarity
+from .lookup import character_similarity, prefix_suggestions
 from .semantic import build_definition_index, semantic_definition_search
 
-__all__ = ["app", "character_similarity", "build_definition_index", "semantic_definition_search"]
+__all__ = ["app", "character_similarity", "prefix_suggestions", "build_definition_index", "semantic_definition_search"]
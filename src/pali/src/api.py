@@ -1,16 +1,19 @@
 import logging
 from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Response
 from pydantic import BaseModel
 
-from .lookup import character_similarity
+from .lookup import SUGGEST_MAX_LIMIT, character_similarity, prefix_suggestions
 from .semantic import semantic_definition_search
 
 app = FastAPI(title="Pali Dictionary Lookup")
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# The dictionary only changes on redeploy, so suggestions can be cached by the browser and CDN.
+SUGGEST_CACHE_CONTROL = "public, max-age=3600, s-maxage=86400, stale-while-revalidate=604800"
+
 
 class SearchResult(BaseModel):
     pali_thai: str
@@ -24,6 +27,16 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
 
 
+class Suggestion(BaseModel):
+    pali_thai: str
+    pali_roman: str
+
+
+class SuggestResponse(BaseModel):
+    query: str
+    results: List[Suggestion]
+
+
 @app.get("/search", response_model=SearchResponse)
 def search(
     q: str = Query(..., description="Thai word to search for"),
@@ -38,6 +51,20 @@ def search(
     return SearchResponse(query=query, results=matches)
 
 
+@app.get("/suggest", response_model=SuggestResponse)
+def suggest(
+    response: Response,
+    q: str = Query(..., description="Thai or Roman prefix typed so far"),
+    limit: int = Query(8, ge=1, le=SUGGEST_MAX_LIMIT, description="Number of suggestions to return"),
+) -> SuggestResponse:
+    """
+    Prefix autocomplete over Thai and Roman headwords, ranked by precomputed priority.
+    """
+    query = q.strip()
+    response.headers["Cache-Control"] = SUGGEST_CACHE_CONTROL
+    return SuggestResponse(query=query, results=prefix_suggestions(query, limit=limit))
+
+
 @app.get("/search/semantic", response_model=SearchResponse)
 def semantic_search(
     q: str = Query(..., description="Free-text meaning to search definitions by"),
@@ -1,11 +1,16 @@
+import heapq
+import os
+import unicodedata
+from bisect import bisect_left
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import pandas as pd
 from rapidfuzz import fuzz, process
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-DICTIONARY_FILE_PATH = PROJECT_ROOT / "data" / "processed" / "pali_dictionary_with_thai.csv"
+DATA_DIR = Path(os.getenv("PALI_DATA_DIR") or PROJECT_ROOT / "data" / "processed")
+DICTIONARY_FILE_PATH = DATA_DIR / "pali_dictionary_with_thai.csv"
 
 # Load once so lookups are fast.
 _dictionary = pd.read_csv(DICTIONARY_FILE_PATH)
@@ -15,6 +20,92 @@ _dictionary = _dictionary[
     ["headword", "headword_thai", "definition"]
 ].dropna(subset=["headword"])
 
+# Prefixes matching more keys than this have their top suggestions precomputed, so a
+# keystroke never scans more than this many keys.
+SUGGEST_SCAN_LIMIT = 256
+SUGGEST_MAX_LIMIT = 20
+
+
+THAI_PHINTHU = "\u0e3a"
+
+
+def _fold(text: str) -> str:
+    """
+    Normalize text for prefix matching. Thai drops phinthu, which the converter uses
+    for conjuncts (ธมฺม) but people do not type (ธมม); other text is lowercased with
+    diacritics removed so "dham" matches "dhāmma".
+    """
+    text = unicodedata.normalize("NFC", text.strip().lower())
+    if any("\u0e00" <= ch <= "\u0e7f" for ch in text):
+        return text.replace(THAI_PHINTHU, "")
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _precompute_heavy_prefixes(keys: List[str], ids: List[int]) -> Dict[str, List[int]]:
+    """
+    Return the top ``SUGGEST_MAX_LIMIT`` ids for every prefix matching more than
+    ``SUGGEST_SCAN_LIMIT`` of the sorted ``keys``. A heavy prefix's parent is heavy too,
+    so prefixes are expanded one character at a time from the heavy ones only.
+    """
+    top: Dict[str, List[int]] = {}
+    frontier = [("", 0, len(keys))]
+    while frontier:
+        next_frontier = []
+        for prefix, lo, hi in frontier:
+            length = len(prefix) + 1
+            start = lo
+            # Keys equal to the prefix itself sort first and have no child.
+            while start < hi and len(keys[start]) < length:
+                start += 1
+            while start < hi:
+                child = keys[start][:length]
+                end = bisect_left(keys, child + "\U0010ffff", start, hi)
+                if end - start > SUGGEST_SCAN_LIMIT:
+                    top[child] = heapq.nsmallest(SUGGEST_MAX_LIMIT, ids[start:end])
+                    next_frontier.append((child, start, end))
+                start = end
+        frontier = next_frontier
+    return top
+
+
+def _build_suggest_index(
+    dictionary: pd.DataFrame,
+) -> Tuple[List[Dict[str, str]], List[str], List[int], Dict[str, List[int]]]:
+    """
+    Build the prefix autocomplete index over ``headword_thai`` and ``headword``.
+
+    Entries are sorted by priority (number of senses, then shorter headword), so an
+    entry's position is its rank and the best suggestions are the smallest ids.
+    Returns the entries, the sorted keys, the entry id for each key and the
+    precomputed top ids for prefixes too common to scan.
+    """
+    headword_column = dictionary["headword"].astype(str)
+    senses = headword_column.value_counts().to_dict()
+    headwords = dictionary.assign(headword=headword_column).drop_duplicates(subset=["headword"])
+    ranked = sorted(
+        headwords.itertuples(index=False),
+        key=lambda row: (-senses[row.headword], len(row.headword), row.headword),
+    )
+
+    entries: List[Dict[str, str]] = []
+    pairs: List[Tuple[str, int]] = []
+    for entry_id, row in enumerate(ranked):
+        thai = row.headword_thai if isinstance(row.headword_thai, str) else ""
+        entries.append({"pali_thai": thai, "pali_roman": row.headword})
+        # Thai and Roman keys never share a prefix, so ids are unique within any prefix range.
+        for key in {_fold(thai), _fold(row.headword)}:
+            if key:
+                pairs.append((key, entry_id))
+    pairs.sort()
+
+    keys = [key for key, _ in pairs]
+    ids = [entry_id for _, entry_id in pairs]
+    return entries, keys, ids, _precompute_heavy_prefixes(keys, ids)
+
+
+_suggest_entries, _suggest_keys, _suggest_ids, _suggest_heavy_prefixes = _build_suggest_index(_dictionary)
+
 
 def character_similarity(word: str, limit: int = 5, score_cutoff: int = 0) -> List[Dict[str, object]]:
     """
@@ -55,4 +146,33 @@ def character_similarity(word: str, limit: int = 5, score_cutoff: int = 0) -> Li
         )
 
     return results
-    
+
+
+def prefix_suggestions(prefix: str, limit: int = 8) -> List[Dict[str, str]]:
+    """
+    Return up to ``limit`` dictionary entries whose Thai or Roman headword starts with
+    ``prefix``, best-ranked first.
+
+    Args:
+        prefix: Thai or Roman prefix typed so far; Thai matching ignores phinthu and Roman
+            matching ignores case and diacritics.
+        limit: Number of suggestions to return (at most ``SUGGEST_MAX_LIMIT``).
+
+    Returns:
+        A list of dictionaries with Thai and Roman spelling.
+    """
+    if not isinstance(prefix, str):
+        return []
+    key = _fold(prefix)
+    if not key:
+        return []
+    limit = min(limit, SUGGEST_MAX_LIMIT)
+
+    lo = bisect_left(_suggest_keys, key)
+    hi = bisect_left(_suggest_keys, key + "\U0010ffff", lo)
+    if hi - lo > SUGGEST_SCAN_LIMIT:
+        ids = _suggest_heavy_prefixes[key][:limit]
+    else:
+        ids = heapq.nsmallest(limit, _suggest_ids[lo:hi])
+
+    return [dict(_suggest_entries[entry_id]) for entry_id in ids]
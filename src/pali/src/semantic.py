@@ -16,9 +16,10 @@ from vertexai import init as vertex_init
 from vertexai.preview.language_models import TextEmbeddingModel
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-DICTIONARY_FILE_PATH = PROJECT_ROOT / "data" / "processed" / "pali_dictionary_with_thai.csv"
-INDEX_PATH = PROJECT_ROOT / "data" / "processed" / "definition_faiss.index"
-METADATA_PATH = PROJECT_ROOT / "data" / "processed" / "definition_faiss_meta.json"
+DATA_DIR = Path(os.getenv("PALI_DATA_DIR") or PROJECT_ROOT / "data" / "processed")
+DICTIONARY_FILE_PATH = DATA_DIR / "pali_dictionary_with_thai.csv"
+INDEX_PATH = DATA_DIR / "definition_faiss.index"
+METADATA_PATH = DATA_DIR / "definition_faiss_meta.json"
 
 # Ensure we emit INFO logs even if the root logger is at WARNING.
 _root_logger = logging.getLogger()
@@ -0,0 +1,20 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+# lookup.py loads the dictionary at import time, so point it at a small fixture first.
+_DATA_DIR = Path(tempfile.mkdtemp(prefix="pali-tests-"))
+pd.DataFrame(
+    [
+        ("dhamma", "ธมฺม", "nature; truth; the teaching"),
+        ("dhamma", "ธมฺม", "mental object"),
+        ("dhammika", "ธมฺมิก", "righteous"),
+        ("dhāraṇa", "ธารณ", "wearing; keeping in mind"),
+        ("buddha", "พุทฺธ", "awakened"),
+        ("mettā", "เมตฺตา", "loving-kindness"),
+    ],
+    columns=["headword", "headword_thai", "definition"],
+).to_csv(_DATA_DIR / "pali_dictionary_with_thai.csv", index=False)
+os.environ["PALI_DATA_DIR"] = str(_DATA_DIR)
@@ -0,0 +1,91 @@
+import random
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from src import lookup
+from src.lookup import SUGGEST_MAX_LIMIT, prefix_suggestions
+
+THAI_SYLLABLES = ["ธ", "ม", "ฺ", "พุ", "ทฺ", "ธา", "ร", "ณ", "เม", "ตฺ", "ตา"]
+ROMAN_SYLLABLES = ["dh", "a", "ā", "m", "bu", "d", "r", "ṇ", "me", "tt"]
+
+
+def _random_dictionary(rng: random.Random, size: int) -> pd.DataFrame:
+    rows = []
+    for _ in range(size):
+        roman = "".join(rng.choice(ROMAN_SYLLABLES) for _ in range(rng.randint(1, 5)))
+        thai = "".join(rng.choice(THAI_SYLLABLES) for _ in range(rng.randint(1, 5)))
+        # Repeat some headwords so sense counts differ.
+        for _ in range(rng.choice([1, 1, 1, 2, 3])):
+            rows.append((roman, thai, "definition"))
+    return pd.DataFrame(rows, columns=["headword", "headword_thai", "definition"])
+
+
+def _ranked_with_keys(dictionary: pd.DataFrame) -> list:
+    senses = Counter(dictionary["headword"])
+    first = dictionary.drop_duplicates(subset=["headword"])
+    ranked = sorted(first.itertuples(index=False), key=lambda row: (-senses[row.headword], len(row.headword), row.headword))
+    return [
+        ({"pali_thai": row.headword_thai, "pali_roman": row.headword}, lookup._fold(row.headword_thai), lookup._fold(row.headword))
+        for row in ranked
+    ]
+
+
+def _brute_force(ranked: list, prefix: str, limit: int) -> list:
+    key = lookup._fold(prefix)
+    return [entry for entry, thai, roman in ranked if thai.startswith(key) or roman.startswith(key)][:limit]
+
+
+def test_prefix_suggestions_match_brute_force_including_heavy_prefixes(monkeypatch):
+    dictionary = _random_dictionary(random.Random(0), 300)
+    monkeypatch.setattr(lookup, "SUGGEST_SCAN_LIMIT", 4)
+    entries, keys, ids, heavy = lookup._build_suggest_index(dictionary)
+    assert heavy, "the fixture should exercise the precomputed path"
+    monkeypatch.setattr(lookup, "_suggest_entries", entries)
+    monkeypatch.setattr(lookup, "_suggest_keys", keys)
+    monkeypatch.setattr(lookup, "_suggest_ids", ids)
+    monkeypatch.setattr(lookup, "_suggest_heavy_prefixes", heavy)
+
+    ranked = _ranked_with_keys(dictionary)
+    prefixes = {key[:length] for key in keys for length in range(1, len(key) + 1)}
+    prefixes |= {prefix.upper() for prefix in prefixes} | {"x", "ธมฺ"}
+    for prefix in sorted(prefixes):
+        for limit in (1, 8, SUGGEST_MAX_LIMIT):
+            assert prefix_suggestions(prefix, limit=limit) == _brute_force(ranked, prefix, limit), prefix
+
+
+@pytest.mark.parametrize(
+    ("prefix", "expected"),
+    [
+        ("ธม", "dhamma"),
+        ("ธมฺม", "dhamma"),
+        ("DHĀ", "dhamma"),
+        ("dhar", "dhāraṇa"),
+        ("metta", "mettā"),
+    ],
+)
+def test_prefix_suggestions_fold_phinthu_and_diacritics(prefix, expected):
+    assert expected in [entry["pali_roman"] for entry in prefix_suggestions(prefix)]
+
+
+def test_prefix_suggestions_rank_by_sense_count_then_length():
+    assert [entry["pali_roman"] for entry in prefix_suggestions("ธม")] == ["dhamma", "dhammika"]
+    assert prefix_suggestions("ธม")[0] == {"pali_thai": "ธมฺม", "pali_roman": "dhamma"}
+    assert prefix_suggestions("  ") == []
+
+
+def test_suggest_endpoint_sets_cache_control_and_bounds_limit():
+    from fastapi.testclient import TestClient
+
+    from src.api import SUGGEST_CACHE_CONTROL, app
+
+    client = TestClient(app)
+    response = client.get("/suggest", params={"q": "ธม", "limit": 1})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == SUGGEST_CACHE_CONTROL
+    assert response.json() == {"query": "ธม", "results": [{"pali_thai": "ธมฺม", "pali_roman": "dhamma"}]}
+
+    assert client.get("/suggest", params={"q": "ธม", "limit": SUGGEST_MAX_LIMIT}).status_code == 200
+    assert client.get("/suggest", params={"q": "ธม", "limit": 0}).status_code == 422
+    assert client.get("/suggest", params={"q": "ธม", "limit": SUGGEST_MAX_LIMIT + 1}).status_code == 422